@@ -15,6 +15,8 @@ import os
 import json
 import math
 import re
+import traceback
+from collections import defaultdict, namedtuple
 
 # Script directory for path resolution
 script_dir = os.path.dirname(__file__)
@@ -62,13 +64,16 @@ except ImportError:
     importlib.invalidate_caches()
     import ezdxf
 
+# numpy is installed alongside ezdxf (see EZDXF_PACKAGES)
+import numpy as np
+
 # .NET interop
 import clr
 import System
 clr.AddReference('RevitAPI')
 clr.AddReference('RevitAPIUI')
 clr.AddReference('System.Windows.Forms')
-from Autodesk.Revit.DB.ExtensibleStorage import Schema as ESSchema
+from Autodesk.Revit.DB.ExtensibleStorage import Schema as ESSchema, ExtensibleStorageFilter
 from System.Windows.Forms import MessageBox, MessageBoxButtons, MessageBoxIcon
 
 # Import export utilities
@@ -91,6 +96,12 @@ FEET_TO_CM = 30.48          # Revit internal units (feet) to centimeters
 FEET_TO_METERS = 0.3048     # Revit internal units (feet) to meters
 DEFAULT_VIEW_SCALE = 100.0  # Default scale (1:100) if not found
 
+# Shared parameter GUIDs, as defined in lib/pyAreaSharedParameters.txt
+SHARED_PARAM_GUIDS = {
+    "Usage Type": System.Guid("a0a1babe-b71a-4f74-9195-634cba8feefa"),
+    "Usage Type Prev": System.Guid("eb99d38d-5aca-4f53-8ae6-a7a5e38175c3"),
+}
+
 # Module-level context for resolve_placeholder (set per-area in the export loop).
 # Keys:
 #   "floor_elevations" - sorted list of (elevation_feet, level_id) for <by Floor Above>
@@ -98,6 +109,49 @@ DEFAULT_VIEW_SCALE = 100.0  # Default scale (1:100) if not found
 #                        (Tel-Aviv: mapped to the ID attribute via the placeholder)
 _resolve_context = {}
 
+# Composite view -> sheet affine per viewport, keyed by viewport ElementId value.
+# Built once by build_sheet_transform() so per-vertex work is plain arithmetic.
+_sheet_transform_cache = {}
+
+# Run-invariant project values (ProjectInformation parameters, base point data),
+# filled lazily on first use and cleared at the start of each export run.
+_project_cache = {}
+
+# get_representedViews_data results keyed by
+# (view id value, municipality, id(calculation_data)); cleared per Calculation group.
+_represented_view_cache = {}
+
+# get_sheet_data_for_dxf results keyed by sheet ElementId value;
+# cleared at the start of each export run.
+_sheet_data_cache = {}
+
+# Parsed sheet JSON keyed by sheet ElementId value. Grouping, validation and
+# export all read the same sheets; cleared at the start of each export run.
+_sheet_json_cache = {}
+
+# AreaScheme lookups keyed by AreaScheme ElementId value: the element itself,
+# its parsed JSON and its municipality. Many viewports share one AreaScheme;
+# cleared at the start of each export run.
+_area_scheme_cache = {}
+_area_scheme_json_cache = {}
+_municipality_cache = {}
+
+# Sheets per CalculationGuid for the whole project, built by the first
+# expand_calculation_sheets() call of a run and reused by every other group.
+_calculation_sheets_cache = {}
+
+# DB.Area elements per AreaPlan view, keyed by view ElementId value. Filled by
+# validation and reused by export; cleared at the start of each export run.
+_view_areas_cache = {}
+
+# create_dxf_layers results keyed by (id(dxf_doc), municipality);
+# cleared whenever a new DXF document is created.
+_layers_cache = {}
+
+# Shared {'layer': name} dxfattribs per layer name. ezdxf copies dxfattribs
+# into each new entity, so one dict can back every entity on a layer.
+_layer_dxfattribs = {}
+
 # Import municipality-specific configuration
 from municipality_schemas import (
     MUNICIPALITIES,
@@ -108,6 +162,24 @@ from municipality_schemas import (
     AREA_FIELDS
 )
 
+# Per-municipality block names and schema fields, resolved once at import
+# so per-area/per-view code does one lookup instead of chained dict probes.
+_MuniContext = namedtuple("_MuniContext", [
+    "sheet_block", "areaplan_block", "area_block",
+    "calculation_fields", "areaplan_fields", "area_fields"
+])
+_MUNI_CTX = {
+    muni: _MuniContext(
+        sheet_block=DXF_CONFIG[muni]["blocks"].get("sheet"),
+        areaplan_block=DXF_CONFIG[muni]["blocks"]["areaplan"],
+        area_block=DXF_CONFIG[muni]["blocks"]["area"],
+        calculation_fields=CALCULATION_FIELDS.get(muni, {}),
+        areaplan_fields=AREAPLAN_FIELDS.get(muni, {}),
+        area_fields=AREA_FIELDS.get(muni, {})
+    )
+    for muni in MUNICIPALITIES
+}
+
 
 # ============================================================================
 # SECTION 3: DATA EXTRACTION (JSON + Revit API)
@@ -130,6 +202,29 @@ def get_element_id_value(element_id):
         return int(element_id.Value)
 
 
+def get_es_schema():
+    """Look up the pyArea extensible storage schema and its JSON field.
+    
+    The lookup is kept in _project_cache once found, so per-element reads
+    skip the Guid construction, the schema table lookup and the field-name
+    resolution. A missing schema is not cached (it may be created later).
+    
+    Returns:
+        tuple: (schema, field), or (None, None) if the schema is not registered
+    """
+    cached = _project_cache.get("es_schema")
+    if cached is not None:
+        return cached
+    
+    schema = ESSchema.Lookup(System.Guid(SCHEMA_GUID))
+    if not schema:
+        return None, None
+    
+    cached = (schema, schema.GetField(FIELD_NAME))
+    _project_cache["es_schema"] = cached
+    return cached
+
+
 def get_json_data(element):
     """Read JSON data from extensible storage (CPython compatible).
     
@@ -140,9 +235,8 @@ def get_json_data(element):
         dict: Parsed JSON data, or empty dict if no data found
     """
     try:
-        # Get schema by GUID
-        schema_guid = System.Guid(SCHEMA_GUID)
-        schema = ESSchema.Lookup(schema_guid)
+        # Get schema and Data field (looked up once per run)
+        schema, field = get_es_schema()
         
         if not schema:
             return {}
@@ -153,7 +247,7 @@ def get_json_data(element):
             return {}
         
         # Read JSON string from Data field
-        json_string = entity.Get[str](FIELD_NAME)
+        json_string = entity.Get[str](field)
         
         if not json_string:
             return {}
@@ -166,6 +260,85 @@ def get_json_data(element):
         return {}
 
 
+def get_json_data_batch(elements):
+    """Read JSON data for many elements with one schema lookup and one parse.
+    
+    The raw strings are joined into a single JSON array and decoded with one
+    json.loads call. If any blob is malformed, falls back to get_json_data per
+    element so only the bad element loses its data.
+    
+    Args:
+        elements: Sequence of Revit elements with extensible storage
+        
+    Returns:
+        list: Parsed JSON data per element (empty dict if no data), in order
+    """
+    schema, field = get_es_schema()
+    if not schema:
+        return [{} for _ in elements]
+    
+    json_strings = []
+    for element in elements:
+        json_string = None
+        try:
+            entity = element.GetEntity(schema)
+            if entity.IsValid():
+                json_string = entity.Get[str](field)
+        except Exception as e:
+            print("Warning: Error reading JSON from element {}: {}".format(element.Id, e))
+        json_strings.append(json_string or "{}")
+    
+    try:
+        data = json.loads("[" + ",".join(json_strings) + "]")
+        if len(data) == len(json_strings):
+            return data
+    except ValueError:
+        pass
+    return [get_json_data(element) for element in elements]
+
+
+def get_sheet_json_data(sheet):
+    """Read a sheet's JSON data, parsing each sheet only once per run.
+    
+    The returned dict is shared between callers and must not be mutated.
+    
+    Args:
+        sheet: DB.ViewSheet element
+        
+    Returns:
+        dict: Parsed JSON data, or empty dict if no data found
+    """
+    key = get_element_id_value(sheet.Id)
+    data = _sheet_json_cache.get(key)
+    if data is None:
+        data = get_json_data(sheet)
+        _sheet_json_cache[key] = data
+    return data
+
+
+# Category filter for Area elements; document independent, so built once
+_AREA_CATEGORY_FILTER = DB.ElementCategoryFilter(DB.BuiltInCategory.OST_Areas)
+
+
+def get_view_areas(view_id):
+    """Get the Area elements visible in a view, collecting each view only once.
+    
+    Args:
+        view_id: DB.ElementId of the AreaPlan view
+        
+    Returns:
+        list: DB.Area elements in the view (cached per run)
+    """
+    key = get_element_id_value(view_id)
+    areas = _view_areas_cache.get(key)
+    if areas is None:
+        # Iterate the collector directly instead of materializing ToElements()
+        collector = DB.FilteredElementCollector(doc, view_id).WherePasses(_AREA_CATEGORY_FILTER).WhereElementIsNotElementType()
+        areas = [a for a in collector if isinstance(a, DB.Area)]
+        _view_areas_cache[key] = areas
+    return areas
+
+
 def get_area_scheme_by_id(element_id):
     """Get AreaScheme element by ID.
     
@@ -179,16 +352,17 @@ def get_area_scheme_by_id(element_id):
         # Convert to ElementId
         if isinstance(element_id, str):
             element_id = int(element_id)
+        if element_id in _area_scheme_cache:
+            return _area_scheme_cache[element_id]
         elem_id = DB.ElementId(element_id)
         
-        # Get element
+        # Get element, verifying it's an AreaScheme
         element = doc.GetElement(elem_id)
+        if not isinstance(element, DB.AreaScheme):
+            element = None
         
-        # Verify it's an AreaScheme
-        if isinstance(element, DB.AreaScheme):
-            return element
-        
-        return None
+        _area_scheme_cache[element_id] = element
+        return element
         
     except Exception as e:
         print("Warning: Error getting AreaScheme by ID {}: {}".format(element_id, e))
@@ -234,6 +408,25 @@ def load_preferences():
         return export_utils.get_default_preferences()
 
 
+def get_area_scheme_json(area_scheme):
+    """Read an AreaScheme's JSON data, parsing each AreaScheme only once per run.
+    
+    The returned dict is shared between callers and must not be mutated.
+    
+    Args:
+        area_scheme: DB.AreaScheme element
+        
+    Returns:
+        dict: Parsed JSON data, or empty dict if no data found
+    """
+    key = get_element_id_value(area_scheme.Id)
+    data = _area_scheme_json_cache.get(key)
+    if data is None:
+        data = get_json_data(area_scheme)
+        _area_scheme_json_cache[key] = data
+    return data
+
+
 def get_municipality_from_areascheme(area_scheme):
     """Extract municipality from AreaScheme element.
     
@@ -246,20 +439,26 @@ def get_municipality_from_areascheme(area_scheme):
     if not area_scheme:
         return "Common"
     
-    data = get_json_data(area_scheme)
+    key = get_element_id_value(area_scheme.Id)
+    municipality = _municipality_cache.get(key)
+    if municipality is not None:
+        return municipality
+    
+    data = get_area_scheme_json(area_scheme)
     municipality = data.get("Municipality", "Common")
     
     # Validate municipality
     if municipality not in MUNICIPALITIES:
         print("Warning: Invalid municipality '{}' , using 'Common'".format(municipality))
-        return "Common"
+        municipality = "Common"
     
+    _municipality_cache[key] = municipality
     return municipality
 
 
 def get_calculations_dict_for_areascheme(area_scheme):
     try:
-        calculations = get_json_data(area_scheme) or {}
+        calculations = get_area_scheme_json(area_scheme) or {}
         return calculations.get("Calculations", {}) or {}
     except Exception:
         return {}
@@ -290,7 +489,10 @@ def resolve_areascheme_for_calculation_on_sheet(sheet_elem, calculation_guid):
 
 
 def get_sheet_data_for_dxf(sheet_elem):
-    """Extract sheet data for DXF export (now via Calculation).
+    """Extract sheet data for DXF export (now via Calculation), once per sheet per run.
+    
+    The municipality lookup, process_sheet and the output filename all ask for
+    the first sheet's data; the result (including None) is cached by sheet id.
     
     Args:
         sheet_elem: DB.ViewSheet element
@@ -298,9 +500,17 @@ def get_sheet_data_for_dxf(sheet_elem):
     Returns:
         dict: Data including calculation_data, area_scheme, municipality, or None if error
     """
+    key = get_element_id_value(sheet_elem.Id)
+    if key not in _sheet_data_cache:
+        _sheet_data_cache[key] = _read_sheet_data_for_dxf(sheet_elem)
+    return _sheet_data_cache[key]
+
+
+def _read_sheet_data_for_dxf(sheet_elem):
+    """Resolve sheet data for get_sheet_data_for_dxf (uncached)."""
     try:
         # Get CalculationGuid from sheet
-        sheet_data = get_json_data(sheet_elem)
+        sheet_data = get_sheet_json_data(sheet_elem)
         calculation_guid = sheet_data.get("CalculationGuid")
         
         if not calculation_guid:
@@ -342,7 +552,6 @@ def get_sheet_data_for_dxf(sheet_elem):
         
     except Exception as e:
         print("Error getting sheet data: {}".format(e))
-        import traceback
         traceback.print_exc()
         return None
 
@@ -362,9 +571,8 @@ def get_areaplan_data_for_dxf(areaplan_elem, calculation_data, municipality):
         # Get JSON data from view (may have None values for inheritance)
         areaplan_raw = get_json_data(areaplan_elem)
         
-        # Get fields for this municipality
-        from municipality_schemas import get_fields_for_element_type
-        areaplan_fields = get_fields_for_element_type("AreaPlan", municipality)
+        # Fields for this municipality (resolved once at import in _MUNI_CTX)
+        areaplan_fields = _MUNI_CTX[municipality].areaplan_fields
         
         # Resolve each field with inheritance
         areaplan_data = {}
@@ -399,33 +607,34 @@ def get_areaplan_data_for_dxf(areaplan_elem, calculation_data, municipality):
     except Exception as e:
         print("Warning: Error getting areaplan data for view {}: {}".format(
             areaplan_elem.Id, e))
-        import traceback
         traceback.print_exc()
         return {}
 
 
-def get_area_data_for_dxf(area_elem, calculation_data, municipality):
+def get_area_data_for_dxf(area_elem, calculation_data, municipality, area_raw=None):
     """Extract area data + parameters for DXF export with inheritance.
     
     Args:
         area_elem: DB.Area element
         calculation_data: Calculation data dictionary (for inheritance)
         municipality: Municipality name
+        area_raw: Area JSON already read via get_json_data_batch (optional)
         
     Returns:
         dict: Resolved Area data including Usage Type parameters
     """
     try:
         # Get JSON data from area (may have None values for inheritance)
-        area_raw = get_json_data(area_elem)
+        if area_raw is None:
+            area_raw = get_json_data(area_elem)
         
-        # Get fields for this municipality
-        from municipality_schemas import get_fields_for_element_type
-        area_fields = get_fields_for_element_type("Area", municipality)
+        # Fields for this municipality (resolved once at import in _MUNI_CTX)
+        area_fields = _MUNI_CTX[municipality].area_fields
+        area_defaults = calculation_data.get("AreaDefaults") if calculation_data else None
         
         # Resolve each field with inheritance
         area_data = {}
-        for field_name in area_fields.keys():
+        for field_name, field_def in area_fields.items():
             # Get element's explicit value
             element_value = area_raw.get(field_name)
             
@@ -435,34 +644,18 @@ def get_area_data_for_dxf(area_elem, calculation_data, municipality):
                 continue
             
             # Try Calculation defaults (AreaDefaults)
-            if calculation_data and "AreaDefaults" in calculation_data:
-                default_value = calculation_data["AreaDefaults"].get(field_name)
+            if area_defaults:
+                default_value = area_defaults.get(field_name)
                 if default_value is not None:
                     area_data[field_name] = default_value
                     continue
             
             # Fall back to schema default
-            field_def = area_fields[field_name]
-            if "default" in field_def:
-                area_data[field_name] = field_def["default"]
-            else:
-                area_data[field_name] = None
+            area_data[field_name] = field_def.get("default")
         
         # Get shared parameters (NOT from JSON)
-        usage_type = ""
-        usage_type_prev = ""
-        
-        param = area_elem.LookupParameter("Usage Type")
-        if param and param.HasValue:
-            usage_type = param.AsString() or ""
-        
-        param = area_elem.LookupParameter("Usage Type Prev")
-        if param and param.HasValue:
-            usage_type_prev = param.AsString() or ""
-        
-        # Add parameters to data
-        area_data["UsageType"] = usage_type
-        area_data["UsageTypePrev"] = usage_type_prev
+        area_data["UsageType"] = _shared_param_string(area_elem, "Usage Type")
+        area_data["UsageTypePrev"] = _shared_param_string(area_elem, "Usage Type Prev")
         
         # Add element reference
         area_data["_element"] = area_elem
@@ -472,7 +665,6 @@ def get_area_data_for_dxf(area_elem, calculation_data, municipality):
     except Exception as e:
         print("Warning: Error getting area data for area {}: {}".format(
             area_elem.Id, e))
-        import traceback
         traceback.print_exc()
         return {}
 
@@ -512,24 +704,31 @@ def get_shared_coordinates(point):
         # Z: GetProjectPosition.Elevation is unreliable for the shared Z offset.
         # Use PBP's BASEPOINT_ELEVATION_PARAM (= PBP elevation in shared coords)
         # plus point.Z (= level elevation relative to PBP).
+        z_meters = (point.Z + _get_pbp_elevation_feet()) * FEET_TO_METERS
+        
+        return x_meters, y_meters, z_meters
+        
+    except Exception as e:
+        print("Warning: Error converting point to shared coordinates: {}".format(e))
+        return None, None, None
+
+
+def _get_pbp_elevation_feet():
+    """Project Base Point elevation in shared coordinates (feet), cached per run."""
+    if "pbp_elevation" not in _project_cache:
         pbp_elev_feet = 0.0
         try:
-            pbp_points = DB.FilteredElementCollector(doc)\
+            pbp = DB.FilteredElementCollector(doc)\
                 .OfCategory(DB.BuiltInCategory.OST_ProjectBasePoint)\
-                .ToElements()
-            if pbp_points and len(pbp_points) > 0:
-                p = pbp_points[0].get_Parameter(DB.BuiltInParameter.BASEPOINT_ELEVATION_PARAM)
+                .FirstElement()
+            if pbp:
+                p = pbp.get_Parameter(DB.BuiltInParameter.BASEPOINT_ELEVATION_PARAM)
                 if p and p.HasValue:
                     pbp_elev_feet = p.AsDouble()
         except Exception:
             pass
-        z_meters = (point.Z + pbp_elev_feet) * FEET_TO_METERS
-        
-        return x_meters, y_meters, z_meters
-        
-    except Exception as e:
-        print("Warning: Error converting point to shared coordinates: {}".format(e))
-        return None, None, None
+        _project_cache["pbp_elevation"] = pbp_elev_feet
+    return _project_cache["pbp_elevation"]
 
 
 def get_internal_from_shared_coordinates(shared_x_meters, shared_y_meters):
@@ -584,19 +783,71 @@ def get_project_base_point():
     """
     try:
         collector = DB.FilteredElementCollector(doc)
-        base_points = collector.OfCategory(DB.BuiltInCategory.OST_ProjectBasePoint).ToElements()
+        base_point = collector.OfCategory(DB.BuiltInCategory.OST_ProjectBasePoint).FirstElement()
         
-        if not base_points or len(base_points) == 0:
+        if not base_point:
             print("Warning: Project Base Point not found")
             return None
         
-        return base_points[0]
+        return base_point
         
     except Exception as e:
         print("Warning: Error getting Project Base Point: {}".format(e))
         return None
 
 
+def _project_param(param_name):
+    """ProjectInformation parameter value as string, cached per run."""
+    key = ("param", param_name)
+    if key not in _project_cache:
+        value = ""
+        proj_info = doc.ProjectInformation
+        if proj_info:
+            param = proj_info.LookupParameter(param_name)
+            if param and param.HasValue:
+                value = param.AsString()
+        _project_cache[key] = value
+    return _project_cache[key]
+
+
+def _shared_param_string(element, param_name):
+    """String value of a shared parameter on element, or "" if unset.
+    
+    Reads by the parameter's fixed GUID from pyAreaSharedParameters.txt (direct
+    lookup), falling back to LookupParameter by name when the element does
+    not carry that GUID.
+    """
+    guid = SHARED_PARAM_GUIDS.get(param_name)
+    param = element.get_Parameter(guid) if guid else None
+    if param is None:
+        param = element.LookupParameter(param_name)
+    if param and param.HasValue:
+        return param.AsString() or ""
+    return ""
+
+
+def _internal_origin_shared_xyz():
+    """Shared coordinates (x, y, z meters) of the internal origin, cached per run."""
+    if "origin_xyz" not in _project_cache:
+        _project_cache["origin_xyz"] = get_shared_coordinates(DB.XYZ(0, 0, 0))
+    return _project_cache["origin_xyz"]
+
+
+def _pbp_shared_xyz():
+    """Shared coordinates (x, y, z meters) of the Project Base Point, cached per run.
+    
+    Returns:
+        tuple: (x, y, z) in meters, or None if the Project Base Point is missing
+    """
+    if "pbp_xyz" not in _project_cache:
+        pbp = get_project_base_point()
+        if pbp and hasattr(pbp, 'Position'):
+            _project_cache["pbp_xyz"] = get_shared_coordinates(pbp.Position)
+        else:
+            _project_cache["pbp_xyz"] = None
+    return _project_cache["pbp_xyz"]
+
+
 def format_meters(value_in_meters):
     """Format a meter value to string with 2 decimal places.
     
@@ -650,81 +901,160 @@ def convert_point_to_realworld(xyz, scale_factor, offset_x, offset_y):
     return ((xyz.X - offset_x) * scale_factor, (xyz.Y - offset_y) * scale_factor)
 
 
-def transform_point_to_sheet(view_point, viewport):
-    """Transform point from view coordinates to sheet coordinates.
+def convert_points_to_realworld(points, scale_factor, offset_x, offset_y):
+    """Convert many sheet points to DXF real-world coordinates in one pass.
     
-    Uses Revit's transformation matrices to properly convert from view space
-    to sheet space, accounting for viewport scale and position.
+    Vectorized form of convert_point_to_realworld: (point - offset) * scale.
+    
+    Args:
+        points: (N, 2) array-like of sheet (x, y) in feet
+        scale_factor: REALWORLD_SCALE_FACTOR (from calculate_realworld_scale_factor)
+        offset_x: Horizontal sheet offset for multi-sheet layout (feet)
+        offset_y: Vertical sheet offset (usually 0) (feet)
+        
+    Returns:
+        np.ndarray: (N, 2) array of DXF real-world cm coordinates
+    """
+    # One copy of the input, then offset and scale in place (no temporaries)
+    result = np.array(points, dtype=np.float64)
+    result -= (offset_x, offset_y)
+    result *= scale_factor
+    return result
+
+
+def build_sheet_transform(viewport, view=None):
+    """Compose the viewport's view -> projection -> sheet transforms into one affine.
+    
+    The Revit transforms are fetched and composed once per viewport and cached,
+    so transforming boundary vertices no longer costs Revit API round-trips.
     
     Note: Only called for validated AreaPlan views with crop regions,
     so transformation matrices are always available.
     
     Args:
-        view_point: DB.XYZ point in view coordinates
         viewport: DB.Viewport element
+        view: The viewport's view if the caller already resolved it
+              (saves a doc.GetElement round-trip)
         
     Returns:
-        DB.XYZ: Point in sheet coordinates
+        tuple: (xx, xy, xz, tx, yx, yy, yz, ty) where
+               sheet_x = xx*X + xy*Y + xz*Z + tx
+               sheet_y = yx*X + yy*Y + yz*Z + ty
     """
-    # Get view from viewport
-    view = doc.GetElement(viewport.ViewId)
+    key = get_element_id_value(viewport.Id)
+    sheet_transform = _sheet_transform_cache.get(key)
+    if sheet_transform is not None:
+        return sheet_transform
     
     # Get transformation chain: view → projection → sheet
+    if view is None:
+        view = doc.GetElement(viewport.ViewId)
     transform_w_boundary = view.GetModelToProjectionTransforms()[0]
     model_to_proj = transform_w_boundary.GetModelToProjectionTransform()
     proj_to_sheet = viewport.GetProjectionToSheetTransform()
     
-    # Apply transformations
-    proj_point = model_to_proj.OfPoint(view_point)
-    sheet_point = proj_to_sheet.OfPoint(proj_point)
+    # Composite columns = proj_to_sheet applied to model_to_proj's basis/origin
+    basis_x = proj_to_sheet.OfVector(model_to_proj.BasisX)
+    basis_y = proj_to_sheet.OfVector(model_to_proj.BasisY)
+    basis_z = proj_to_sheet.OfVector(model_to_proj.BasisZ)
+    origin = proj_to_sheet.OfPoint(model_to_proj.Origin)
     
-    return sheet_point
+    sheet_transform = (
+        basis_x.X, basis_y.X, basis_z.X, origin.X,
+        basis_x.Y, basis_y.Y, basis_z.Y, origin.Y
+    )
+    _sheet_transform_cache[key] = sheet_transform
+    return sheet_transform
 
 
-def calculate_arc_bulge(start_pt, end_pt, center_pt, mid_pt):
-    """Calculate DXF bulge: tan(angle/4) with mid-point determining arc direction.
-    
-    The bulge is the tangent of 1/4 the included angle of the arc.
-    This version uses the arc center and tests both directions to ensure correct orientation.
+def transform_points_to_sheet(points, sheet_transform):
+    """Transform view points to sheet (x, y) using a composite affine.
     
     Args:
-        start_pt: Start point (DB.XYZ)
-        end_pt: End point (DB.XYZ)
-        center_pt: Arc center point (DB.XYZ)
-        mid_pt: Mid point on arc (DB.XYZ)
+        points: Iterable of DB.XYZ points in view coordinates
+        sheet_transform: Tuple from build_sheet_transform()
         
     Returns:
-        float: Bulge value for DXF polyline, or 0 if calculation fails
+        list: (x, y) tuples in sheet coordinates (feet)
     """
-    try:
-        # Angles from center to start/end
-        start_angle = math.atan2(start_pt.Y - center_pt.Y, start_pt.X - center_pt.X)
-        end_angle = math.atan2(end_pt.Y - center_pt.Y, end_pt.X - center_pt.X)
-        angle_diff = (end_angle - start_angle) % (2 * math.pi)
-        
-        # Radius
-        radius = math.hypot(start_pt.X - center_pt.X, start_pt.Y - center_pt.Y)
-        
-        # Test both directions: which computed mid-point is closer to actual mid-point?
-        test_ccw = start_angle + angle_diff / 2.0
-        dist_ccw = math.hypot(
-            mid_pt.X - (center_pt.X + radius * math.cos(test_ccw)),
-            mid_pt.Y - (center_pt.Y + radius * math.sin(test_ccw))
-        )
+    xx, xy, xz, tx, yx, yy, yz, ty = sheet_transform
+    result = []
+    for pt in points:
+        x, y, z = pt.X, pt.Y, pt.Z
+        result.append((xx * x + xy * y + xz * z + tx,
+                       yx * x + yy * y + yz * z + ty))
+    return result
+
+
+def build_dxf_affine(sheet_transform, scale_factor, offset_x, offset_y):
+    """Fold the view -> sheet affine and the sheet -> DXF conversion into one matrix.
+    
+    dxf = (sheet - offset) * scale, so the combined 2x4 matrix is the sheet
+    affine scaled by scale_factor with the offset folded into its last column.
+    
+    Args:
+        sheet_transform: Tuple from build_sheet_transform()
+        scale_factor: REALWORLD_SCALE_FACTOR
+        offset_x: Horizontal offset (feet)
+        offset_y: Vertical offset (feet)
         
-        test_cw = start_angle - (2 * math.pi - angle_diff) / 2.0
-        dist_cw = math.hypot(
-            mid_pt.X - (center_pt.X + radius * math.cos(test_cw)),
-            mid_pt.Y - (center_pt.Y + radius * math.sin(test_cw))
-        )
+    Returns:
+        np.ndarray: (2, 4) affine; dxf_xy = xyz @ A[:, :3].T + A[:, 3]
+    """
+    xx, xy, xz, tx, yx, yy, yz, ty = sheet_transform
+    return np.array((
+        (xx, xy, xz, tx - offset_x),
+        (yx, yy, yz, ty - offset_y),
+    ), dtype=np.float64) * scale_factor
+
+
+def transform_point_to_sheet(view_point, viewport):
+    """Transform point from view coordinates to sheet coordinates.
+    
+    Uses the cached composite transform from build_sheet_transform(),
+    accounting for viewport scale and position.
+    
+    Args:
+        view_point: DB.XYZ point in view coordinates
+        viewport: DB.Viewport element
         
-        # Use the direction that matches the actual arc
-        included_angle = angle_diff if dist_ccw < dist_cw else -(2 * math.pi - angle_diff)
-        return math.tan(included_angle / 4.0)
+    Returns:
+        DB.XYZ: Point in sheet coordinates (Z = 0, sheet plane)
+    """
+    sheet_x, sheet_y = transform_points_to_sheet([view_point], build_sheet_transform(viewport))[0]
+    return DB.XYZ(sheet_x, sheet_y, 0)
+
+
+def calculate_arc_bulges(arcs):
+    """Calculate DXF bulges tan(angle/4) for many arcs in one NumPy pass.
+    
+    The bulge is the tangent of 1/4 the included angle of the arc.
+    The arc direction is the sign of the cross product of the center->mid and
+    center->end vectors: positive when the arc runs counter-clockwise.
+    
+    Args:
+        arcs: (K, 4, 2) array-like of (start, end, center, mid) points,
+              each point an (x, y) pair
         
-    except Exception as e:
-        print("Warning: Error calculating arc bulge: {}".format(e))
-        return 0.0
+    Returns:
+        np.ndarray: (K,) bulge values for DXF polyline vertices
+    """
+    arcs = np.asarray(arcs, dtype=np.float64).reshape(-1, 4, 2)
+    center = arcs[:, 2]
+    start = arcs[:, 0] - center
+    end = arcs[:, 1] - center
+    mid = arcs[:, 3] - center
+    
+    # Counter-clockwise angle from start to end, from one arctan2 of the
+    # cross and dot products instead of two absolute angles
+    sweep = np.arctan2(start[:, 0] * end[:, 1] - start[:, 1] * end[:, 0],
+                       start[:, 0] * end[:, 0] + start[:, 1] * end[:, 1])
+    angle_diff = sweep % (2 * np.pi)
+    
+    # Direction: end lies counter-clockwise of mid for a CCW arc
+    cross = mid[:, 0] * end[:, 1] - mid[:, 1] * end[:, 0]
+    included_angle = np.where(cross >= 0, angle_diff, angle_diff - 2 * np.pi)
+    return np.tan(included_angle / 4.0)
 
 
 # ============================================================================
@@ -742,7 +1072,12 @@ def is_blank(value):
     
     Note: 0 and False are NOT considered blank (important for int/bool fields)
     """
-    return value is None or (isinstance(value, str) and value.strip() == "")
+    if value is None:
+        return True
+    if type(value) is str:
+        # isspace() scans without allocating a stripped copy
+        return not value or value.isspace()
+    return False
 
 
 def with_defaults(data, schema_fields_for_muni):
@@ -753,19 +1088,155 @@ def with_defaults(data, schema_fields_for_muni):
         schema_fields_for_muni: Field schema dict for specific municipality
         
     Returns:
-        dict: New dictionary with defaults applied
+        dict: data itself if no default is needed, otherwise a new dictionary
+              with defaults applied (callers must not mutate the result)
     """
-    result = dict(data)
+    missing = None
     for field_name, field_spec in schema_fields_for_muni.items():
-        if is_blank(result.get(field_name)) and "default" in field_spec:
-            result[field_name] = field_spec["default"]
+        if "default" not in field_spec:
+            continue
+        if is_blank(data.get(field_name)):
+            if missing is None:
+                missing = {}
+            missing[field_name] = field_spec["default"]
+    
+    # Common case: every defaulted field already has a value - skip the copy
+    if missing is None:
+        return data
+    
+    result = dict(data)
+    result.update(missing)
     return result
 
 
+def _get_level(element):
+    """Associated level of a view (GenLevel) in one attribute probe, or None."""
+    return getattr(element, 'GenLevel', None)
+
+
+def _h_view_name(element):
+    return getattr(element, 'Name', "")
+
+
+def _h_level_name(element):
+    level = _get_level(element)
+    return level.Name if level else ""
+
+
+def _h_title_on_sheet(element):
+    param = element.LookupParameter("Title on Sheet")
+    if param and param.HasValue:
+        title_value = param.AsString()
+        # Check if the value is not empty/blank
+        if title_value and title_value.strip():
+            return title_value
+    # Fallback to level name if no title on sheet or if empty
+    return _h_level_name(element)
+
+
+def _h_by_project_base_point(element):
+    # Get level elevation relative to Project Base Point and convert to meters
+    level = _get_level(element)
+    if not level:
+        return ""
+    return format_meters(level.Elevation * FEET_TO_METERS)
+
+
+def _h_by_shared_coordinates(element):
+    # Get level elevation in shared coordinate system
+    level = _get_level(element)
+    if not level:
+        return ""
+    # Create a point at the level's elevation (in project coordinates)
+    level_point = DB.XYZ(0, 0, level.Elevation)
+    # Transform to shared coordinates and get Z component
+    _, _, z_meters = get_shared_coordinates(level_point)
+    return format_meters(z_meters)
+
+
+def _h_by_floor_above(element):
+    # Height = distance to next floor above (in meters)
+    # Uses only AreaPlan levels in current calculation (via _resolve_context)
+    level = _get_level(element)
+    if not level:
+        return ""
+    level_elevation = level.Elevation
+    floor_elevations = _resolve_context.get("floor_elevations", [])
+    for elev, lid in floor_elevations:
+        if elev > level_elevation + 0.001:  # tolerance
+            diff_meters = (elev - level_elevation) * FEET_TO_METERS
+            return format_meters(diff_meters)
+    return "3.00"  # topmost floor default: 3m
+
+
+def _h_auto_number(element):
+    # Sequential number assigned per view (set via module-level _resolve_context)
+    if "auto_number" in _resolve_context:
+        return str(_resolve_context["auto_number"])
+    return ""
+
+
+def _h_project_param(param_name):
+    """Build a handler reading a ProjectInformation parameter."""
+    def handler(element):
+        return _project_param(param_name)
+    return handler
+
+
+def _h_internal_origin(axis):
+    """Build a handler for a shared coordinate (0=E/W, 1=N/S) of the internal origin."""
+    def handler(element):
+        return format_meters(_internal_origin_shared_xyz()[axis])
+    return handler
+
+
+def _h_project_base_point(axis):
+    """Build a handler for a shared coordinate (0=E/W, 1=N/S, 2=elevation) of the PBP."""
+    def handler(element):
+        pbp_xyz = _pbp_shared_xyz()
+        if pbp_xyz is None:
+            return ""
+        return format_meters(pbp_xyz[axis])
+    return handler
+
+
+def _h_area_number(element):
+    # Get the area number from the Area element
+    if isinstance(element, DB.Area) and hasattr(element, 'Number'):
+        area_number = element.Number
+        if area_number:
+            return str(area_number)
+    return ""
+
+
+# Placeholder string -> handler(element) returning the resolved string
+_PLACEHOLDER_HANDLERS = {
+    "<View Name>": _h_view_name,
+    "<Level Name>": _h_level_name,
+    "<Title on Sheet>": _h_title_on_sheet,
+    "<by Project Base Point>": _h_by_project_base_point,
+    "<by Shared Coordinates>": _h_by_shared_coordinates,
+    "<by Floor Above>": _h_by_floor_above,
+    "<AutoNumber>": _h_auto_number,
+    # Project-level placeholders (from ProjectInformation)
+    "<Project Name>": _h_project_param("Project Name"),
+    "<Project Number>": _h_project_param("Project Number"),
+    # Coordinate placeholders - Shared Coordinates
+    "<E/W@InternalOrigin>": _h_internal_origin(0),
+    "<N/S@InternalOrigin>": _h_internal_origin(1),
+    "<E/W@ProjectBasePoint>": _h_project_base_point(0),
+    "<N/S@ProjectBasePoint>": _h_project_base_point(1),
+    "<SharedElevation@ProjectBasePoint>": _h_project_base_point(2),
+    # Area-specific placeholders
+    "<AreaNumber>": _h_area_number,
+}
+
+
 def resolve_placeholder(placeholder_value, element):
     """Resolve a placeholder string to its actual value.
     
     Simple direct resolution - just pass the element and get the value.
+    Dispatches through _PLACEHOLDER_HANDLERS.
     
     Args:
         placeholder_value: String that may be a placeholder (e.g., "<View Name>")
@@ -774,143 +1245,32 @@ def resolve_placeholder(placeholder_value, element):
     Returns:
         str: Resolved value, or original value if not a placeholder
     """
-    if not placeholder_value or not isinstance(placeholder_value, str):
+    if not placeholder_value or type(placeholder_value) is not str:
         return placeholder_value or ""
     
-    # Not a placeholder - return as-is
-    if not (placeholder_value.startswith("<") and placeholder_value.endswith(">")):
+    # Not a placeholder - return as-is (first-char test rejects most plain values)
+    if placeholder_value[0] != "<" or placeholder_value[-1] != ">":
         return placeholder_value
     
-    # Resolve based on placeholder type
+    handler = _PLACEHOLDER_HANDLERS.get(placeholder_value)
+    if handler is None:
+        # Unresolved placeholder
+        return ""
+    
     try:
-        if placeholder_value == "<View Name>":
-            return element.Name if hasattr(element, 'Name') else ""
-        
-        elif placeholder_value == "<Level Name>":
-            # Get associated level name
-            if hasattr(element, 'GenLevel'):
-                level = element.GenLevel
-                if level:
-                    return level.Name
-            return ""
-        
-        elif placeholder_value == "<Title on Sheet>":
-            param = element.LookupParameter("Title on Sheet")
-            if param and param.HasValue:
-                title_value = param.AsString()
-                # Check if the value is not empty/blank
-                if title_value and title_value.strip():
-                    return title_value
-            # Fallback to level name if no title on sheet or if empty
-            if hasattr(element, 'GenLevel'):
-                level = element.GenLevel
-                if level:
-                    return level.Name
-            return ""
-        
-        elif placeholder_value == "<by Project Base Point>":
-            # Get level elevation relative to Project Base Point and convert to meters
-            if hasattr(element, 'GenLevel'):
-                level = element.GenLevel
-                if level:
-                    elevation_feet = level.Elevation
-                    elevation_meters = elevation_feet * FEET_TO_METERS
-                    return format_meters(elevation_meters)
-            return ""
-        
-        elif placeholder_value == "<by Shared Coordinates>":
-            # Get level elevation in shared coordinate system
-            if hasattr(element, 'GenLevel'):
-                level = element.GenLevel
-                if level:
-                    # Create a point at the level's elevation (in project coordinates)
-                    level_point = DB.XYZ(0, 0, level.Elevation)
-                    # Transform to shared coordinates and get Z component
-                    _, _, z_meters = get_shared_coordinates(level_point)
-                    return format_meters(z_meters)
-            return ""
-        
-        elif placeholder_value == "<by Floor Above>":
-            # Height = distance to next floor above (in meters)
-            # Uses only AreaPlan levels in current calculation (via _resolve_context)
-            if hasattr(element, 'GenLevel'):
-                level = element.GenLevel
-                if level:
-                    floor_elevations = _resolve_context.get("floor_elevations", [])
-                    for elev, lid in floor_elevations:
-                        if elev > level.Elevation + 0.001:  # tolerance
-                            diff_meters = (elev - level.Elevation) * FEET_TO_METERS
-                            return format_meters(diff_meters)
-                    return "3.00"  # topmost floor default: 3m
-            return ""
-        
-        elif placeholder_value == "<AutoNumber>":
-            # Sequential number assigned per view (set via module-level _resolve_context)
-            if "auto_number" in _resolve_context:
-                return str(_resolve_context["auto_number"])
-            return ""
-        
-        # Project-level placeholders (from ProjectInformation)
-        elif placeholder_value == "<Project Name>":
-            proj_info = doc.ProjectInformation
-            if proj_info:
-                param = proj_info.LookupParameter("Project Name")
-                if param and param.HasValue:
-                    return param.AsString()
-            return ""
-        
-        elif placeholder_value == "<Project Number>":
-            proj_info = doc.ProjectInformation
-            if proj_info:
-                param = proj_info.LookupParameter("Project Number")
-                if param and param.HasValue:
-                    return param.AsString()
-            return ""
-        
-        # Coordinate placeholders - Shared Coordinates
-        elif placeholder_value == "<E/W@InternalOrigin>":
-            x, _, _ = get_shared_coordinates(DB.XYZ(0, 0, 0))
-            return format_meters(x)
-        
-        elif placeholder_value == "<N/S@InternalOrigin>":
-            _, y, _ = get_shared_coordinates(DB.XYZ(0, 0, 0))
-            return format_meters(y)
-        
-        elif placeholder_value == "<E/W@ProjectBasePoint>":
-            pbp = get_project_base_point()
-            if pbp and hasattr(pbp, 'Position'):
-                x, _, _ = get_shared_coordinates(pbp.Position)
-                return format_meters(x)
-            return ""
-        
-        elif placeholder_value == "<N/S@ProjectBasePoint>":
-            pbp = get_project_base_point()
-            if pbp and hasattr(pbp, 'Position'):
-                _, y, _ = get_shared_coordinates(pbp.Position)
-                return format_meters(y)
-            return ""
-        
-        elif placeholder_value == "<SharedElevation@ProjectBasePoint>":
-            pbp = get_project_base_point()
-            if pbp and hasattr(pbp, 'Position'):
-                _, _, z = get_shared_coordinates(pbp.Position)
-                return format_meters(z)
-            return ""
-        
-        # Area-specific placeholders
-        elif placeholder_value == "<AreaNumber>":
-            # Get the area number from the Area element
-            if isinstance(element, DB.Area) and hasattr(element, 'Number'):
-                area_number = element.Number
-                if area_number:
-                    return str(area_number)
-            return ""
-        
+        return handler(element)
     except Exception as e:
         print("  Warning: Error resolving placeholder '{}': {}".format(placeholder_value, e))
-    
-    # Unresolved placeholder
-    return ""
+        return ""
+
+
+# AreaPlan (floor name field, elevation field) read for represented views.
+# Tel-Aviv doesn't use elevation in the block.
+_REPRESENTED_VIEW_FIELDS = {
+    "Jerusalem": ("FLOOR_NAME", "FLOOR_ELEVATION"),
+    "Tel-Aviv": ("FLOOR", None),
+    "Common": ("FLOOR", "LEVEL_ELEVATION"),
+}
 
 
 def get_representedViews_data(view_elem_id, municipality, calculation_data):
@@ -932,19 +1292,23 @@ def get_representedViews_data(view_elem_id, municipality, calculation_data):
         tuple: (floor_name, elevation_str) or (None, None) if view not found
     """
     try:
-        # Convert to ElementId
-        if isinstance(view_elem_id, str):
-            elem_id = DB.ElementId(int(view_elem_id))
-        elif isinstance(view_elem_id, int):
-            elem_id = DB.ElementId(view_elem_id)
-        else:
-            elem_id = view_elem_id
+        # RepresentedViews ids are stored as int or str in JSON and convert
+        # without touching the API; anything else is already a DB.ElementId
+        is_json_id = isinstance(view_elem_id, (int, str))
+        id_value = int(view_elem_id) if is_json_id else get_element_id_value(view_elem_id)
+        
+        # Same view is often represented by several main AreaPlans
+        cache_key = (id_value, municipality, id(calculation_data))
+        if cache_key in _represented_view_cache:
+            return _represented_view_cache[cache_key]
         
         # Get the view element
+        elem_id = DB.ElementId(id_value) if is_json_id else view_elem_id
         view = doc.GetElement(elem_id)
         
         # Verify it's an AreaPlan view
         if not (isinstance(view, DB.ViewPlan) and view.ViewType == DB.ViewType.AreaPlan):
+            _represented_view_cache[cache_key] = (None, None)
             return None, None
         
         # Use the same inheritance logic as main AreaPlans to get field values
@@ -954,20 +1318,16 @@ def get_representedViews_data(view_elem_id, municipality, calculation_data):
             return None, None
 
         # Extract floor name and elevation based on municipality
-        if municipality == "Jerusalem":
-            floor_name_field = represented_data.get("FLOOR_NAME", "")
-            elevation_field = represented_data.get("FLOOR_ELEVATION", "")
-        elif municipality == "Tel-Aviv":
-            floor_name_field = represented_data.get("FLOOR", "")
-            elevation_field = None  # Tel-Aviv doesn't use elevation in the template
-        else:  # Common
-            floor_name_field = represented_data.get("FLOOR", "")
-            elevation_field = represented_data.get("LEVEL_ELEVATION", "")
+        floor_key, elevation_key = _REPRESENTED_VIEW_FIELDS.get(
+            municipality, _REPRESENTED_VIEW_FIELDS["Common"])
+        floor_name_field = represented_data.get(floor_key, "")
+        elevation_field = represented_data.get(elevation_key, "") if elevation_key else None
 
         # Resolve placeholders using the represented view element
         floor_name = resolve_placeholder(floor_name_field, view)
         elevation = resolve_placeholder(elevation_field, view) if elevation_field else None
         
+        _represented_view_cache[cache_key] = (floor_name, elevation)
         return floor_name, elevation
         
     except Exception as e:
@@ -1002,12 +1362,11 @@ def get_sheet_block_attribs(sheet_data, municipality, page_number):
     """
     try:
         # Get block configuration
-        block_name = DXF_CONFIG[municipality]["blocks"].get("sheet")
-        if not block_name:
+        muni_ctx = _MUNI_CTX[municipality]
+        if not muni_ctx.sheet_block:
             return None
         
-        calc_fields = CALCULATION_FIELDS.get(municipality, {})
-        data = with_defaults(sheet_data, calc_fields)
+        data = with_defaults(sheet_data, muni_ctx.calculation_fields)
         
         if municipality == "Jerusalem":
             return {
@@ -1029,6 +1388,28 @@ def get_sheet_block_attribs(sheet_data, municipality, page_number):
         return None
 
 
+def _get_represented_floors(represented_views, municipality, calculation_data, require_elevation):
+    """Resolve a RepresentedViews list into (floor_name, elevation) pairs in one pass.
+    
+    Args:
+        represented_views: RepresentedViews value from AreaPlan data (list of view ids)
+        municipality: Municipality name
+        calculation_data: Calculation data dictionary (for inheritance)
+        require_elevation: If True, drop views without a resolved elevation
+        
+    Returns:
+        list: (floor_name, elevation) tuples for views with usable data
+    """
+    if not represented_views or not isinstance(represented_views, list):
+        return []
+    floors = []
+    for view_id in represented_views:
+        rep_floor_name, rep_elevation = get_representedViews_data(view_id, municipality, calculation_data)
+        if rep_floor_name and (rep_elevation or not require_elevation):
+            floors.append((rep_floor_name, rep_elevation))
+    return floors
+
+
 def get_areaplan_block_attribs(areaplan_data, municipality, areaplan_elem, calculation_data):
     """Build block attribute dict for areaplan-level block insertion.
     
@@ -1044,24 +1425,17 @@ def get_areaplan_block_attribs(areaplan_data, municipality, areaplan_elem, calcu
         dict: {ATTRIB_TAG: value}
     """
     try:
-        schema_fields = AREAPLAN_FIELDS.get(municipality, {})
-        data = with_defaults(areaplan_data, schema_fields)
+        data = with_defaults(areaplan_data, _MUNI_CTX[municipality].areaplan_fields)
         
         if municipality == "Jerusalem":
             floor_name = resolve_placeholder(data.get("FLOOR_NAME", ""), areaplan_elem)
             floor_elevation = resolve_placeholder(data.get("FLOOR_ELEVATION", ""), areaplan_elem)
             
-            represented_views = data.get("RepresentedViews", [])
-            if represented_views and isinstance(represented_views, list) and len(represented_views) > 0:
-                floor_names = [floor_name] if floor_name else []
-                floor_elevations = [floor_elevation] if floor_elevation else []
-                for view_id in represented_views:
-                    rep_floor_name, rep_elevation = get_representedViews_data(view_id, municipality, calculation_data)
-                    if rep_floor_name and rep_elevation:
-                        floor_names.append(rep_floor_name)
-                        floor_elevations.append(rep_elevation)
-                floor_name = ",".join(floor_names)
-                floor_elevation = ",".join(floor_elevations)
+            rep_floors = _get_represented_floors(
+                data.get("RepresentedViews"), municipality, calculation_data, require_elevation=True)
+            if rep_floors:
+                floor_name = ",".join(([floor_name] if floor_name else []) + [n for n, _ in rep_floors])
+                floor_elevation = ",".join(([floor_elevation] if floor_elevation else []) + [e for _, e in rep_floors])
             
             return {
                 "BUILDING_NAME": resolve_placeholder(data.get("BUILDING_NAME", "1"), areaplan_elem),
@@ -1072,14 +1446,10 @@ def get_areaplan_block_attribs(areaplan_data, municipality, areaplan_elem, calcu
         elif municipality == "Tel-Aviv":
             floor = resolve_placeholder(data.get("FLOOR", ""), areaplan_elem)
             
-            represented_views = data.get("RepresentedViews", [])
-            if represented_views and isinstance(represented_views, list) and len(represented_views) > 0:
-                floor_names = [floor] if floor else []
-                for view_id in represented_views:
-                    rep_floor_name, _ = get_representedViews_data(view_id, municipality, calculation_data)
-                    if rep_floor_name:
-                        floor_names.append(rep_floor_name)
-                floor = ",".join(floor_names)
+            rep_floors = _get_represented_floors(
+                data.get("RepresentedViews"), municipality, calculation_data, require_elevation=False)
+            if rep_floors:
+                floor = ",".join(([floor] if floor else []) + [n for n, _ in rep_floors])
             
             return {
                 "FLOOR": floor,
@@ -1093,17 +1463,11 @@ def get_areaplan_block_attribs(areaplan_data, municipality, areaplan_elem, calcu
             floor = resolve_placeholder(data.get("FLOOR", ""), areaplan_elem)
             level_elevation = resolve_placeholder(data.get("LEVEL_ELEVATION", ""), areaplan_elem)
             
-            represented_views = data.get("RepresentedViews", [])
-            if represented_views and isinstance(represented_views, list) and len(represented_views) > 0:
-                floor_names = [floor] if floor else []
-                level_elevations = [level_elevation] if level_elevation else []
-                for view_id in represented_views:
-                    rep_floor_name, rep_elevation = get_representedViews_data(view_id, municipality, calculation_data)
-                    if rep_floor_name and rep_elevation:
-                        floor_names.append(rep_floor_name)
-                        level_elevations.append(rep_elevation)
-                floor = ",".join(floor_names)
-                level_elevation = ",".join(level_elevations)
+            rep_floors = _get_represented_floors(
+                data.get("RepresentedViews"), municipality, calculation_data, require_elevation=True)
+            if rep_floors:
+                floor = ",".join(([floor] if floor else []) + [n for n, _ in rep_floors])
+                level_elevation = ",".join(([level_elevation] if level_elevation else []) + [e for _, e in rep_floors])
             
             return {
                 "BUILDING_NO": str(data.get("BUILDING_NO", "1")),
@@ -1131,8 +1495,7 @@ def get_area_block_attribs(area_data, municipality, area_elem):
         dict: {ATTRIB_TAG: value}
     """
     try:
-        schema_fields = AREA_FIELDS.get(municipality, {})
-        data = with_defaults(area_data, schema_fields)
+        data = with_defaults(area_data, _MUNI_CTX[municipality].area_fields)
         
         if municipality == "Jerusalem":
             return {
@@ -1180,19 +1543,29 @@ def create_dxf_layers(dxf_doc, municipality):
     Returns:
         dict: Layer name mapping for quick access
     """
+    cache_key = (id(dxf_doc), municipality)
+    if cache_key in _layers_cache:
+        return _layers_cache[cache_key]
+    
     try:
         # Get layer configuration
-        layers = DXF_CONFIG[municipality]["layers"]
-        layer_colors = DXF_CONFIG[municipality]["layer_colors"]
+        muni_config = DXF_CONFIG[municipality]
+        layers = muni_config["layers"]
+        layer_colors = muni_config["layer_colors"]
+        
+        # Existing layer names (DXF layer names are case-insensitive)
+        existing = {layer.dxf.name.lower() for layer in dxf_doc.layers}
         
         # Create each layer with its color
         for layer_key, layer_name in layers.items():
-            if layer_name not in dxf_doc.layers:
+            if layer_name.lower() not in existing:
                 layer = dxf_doc.layers.new(name=layer_name)
+                existing.add(layer_name.lower())
                 # Set color if defined
                 if layer_name in layer_colors:
                     layer.color = layer_colors[layer_name]
         
+        _layers_cache[cache_key] = layers
         return layers
         
     except Exception as e:
@@ -1200,6 +1573,21 @@ def create_dxf_layers(dxf_doc, municipality):
         return {}
 
 
+def layer_dxfattribs(layer_name):
+    """Get the shared dxfattribs dict for entities on a layer.
+    
+    Args:
+        layer_name: DXF layer name
+        
+    Returns:
+        dict: {'layer': layer_name}; callers must not mutate it
+    """
+    attribs = _layer_dxfattribs.get(layer_name)
+    if attribs is None:
+        attribs = _layer_dxfattribs[layer_name] = {'layer': layer_name}
+    return attribs
+
+
 def add_rectangle(msp, min_point, max_point, layer_name):
     """Add rectangle to DXF using polyline.
     
@@ -1221,7 +1609,7 @@ def add_rectangle(msp, min_point, max_point, layer_name):
             (x_min, y_max)
         ]
         
-        polyline = msp.add_lwpolyline(points, dxfattribs={'layer': layer_name})
+        polyline = msp.add_lwpolyline(points, dxfattribs=layer_dxfattribs(layer_name))
         polyline.closed = True
         
     except Exception as e:
@@ -1244,18 +1632,20 @@ def add_polyline_with_arcs(msp, points, layer_name, bulges=None):
         
         # If bulges provided, create polyline with bulges in xyseb format
         if bulges and len(bulges) > 0:
+            # Pad short bulge lists (e.g. one per segment) so zip covers every point
+            missing = len(points) - len(bulges)
+            if missing > 0:
+                bulges = list(bulges) + [0.0] * missing
+            
             # Create points_with_bulge list: (x, y, start_width, end_width, bulge)
-            points_with_bulge = []
-            for i, (x, y) in enumerate(points):
-                bulge_val = bulges[i] if i < len(bulges) else 0.0
-                points_with_bulge.append((x, y, 0, 0, bulge_val))
+            points_with_bulge = [(x, y, 0, 0, b) for (x, y), b in zip(points, bulges)]
             
             # Create polyline with bulge values using xyseb format
-            polyline = msp.add_lwpolyline(points_with_bulge, format='xyseb', dxfattribs={'layer': layer_name})
+            polyline = msp.add_lwpolyline(points_with_bulge, format='xyseb', dxfattribs=layer_dxfattribs(layer_name))
             polyline.closed = True
         else:
             # Simple polyline without arcs
-            polyline = msp.add_lwpolyline(points, dxfattribs={'layer': layer_name})
+            polyline = msp.add_lwpolyline(points, dxfattribs=layer_dxfattribs(layer_name))
             polyline.closed = True
         
     except Exception as e:
@@ -1364,7 +1754,6 @@ def import_blocks_from_dxf(target_doc, source_dxf_path, block_names=None):
         
     except Exception as e:
         print("  Warning: Error importing blocks from {}: {}".format(source_dxf_path, e))
-        import traceback
         traceback.print_exc()
         return []
 
@@ -1408,6 +1797,10 @@ def insert_block_with_attributes(msp, block_name, insert_point, attributes, laye
 # SECTION 7: PROCESSING PIPELINE
 # ============================================================================
 
+# Default boundary options are document independent, so one instance serves every area
+_BOUNDARY_OPTIONS = DB.SpatialElementBoundaryOptions()
+
+
 def get_area_exterior_loop(area_elem):
     """Get the exterior boundary loop of an area as the raw BoundarySegment list.
     
@@ -1421,30 +1814,38 @@ def get_area_exterior_loop(area_elem):
         The exterior BoundarySegment loop, or None if not found
     """
     try:
-        boundary_options = DB.SpatialElementBoundaryOptions()
-        boundary_segments = area_elem.GetBoundarySegments(boundary_options)
+        boundary_segments = area_elem.GetBoundarySegments(_BOUNDARY_OPTIONS)
         
-        if not boundary_segments or len(boundary_segments) == 0:
+        loop_count = boundary_segments.Count if boundary_segments else 0
+        if loop_count == 0:
             return None
         
+        # No holes: the only loop is the exterior, skip the shoelace comparison
+        if loop_count == 1:
+            return boundary_segments[0]
+        
         exterior_loop = None
         max_abs_area = 0.0
         for loop in boundary_segments:
-            pts = []
+            xs = []
+            ys = []
+            add_x = xs.append
+            add_y = ys.append
             for segment in loop:
-                curve = segment.GetCurve()
-                tess_pts = list(curve.Tessellate())
-                pts.extend(tess_pts[:-1])
-            if len(pts) < 3:
+                # Stream the tessellation; each segment's last point is the
+                # next segment's first, so it is held back and dropped
+                prev = None
+                for p in segment.GetCurve().Tessellate():
+                    if prev is not None:
+                        add_x(prev.X)
+                        add_y(prev.Y)
+                    prev = p
+            if len(xs) < 3:
                 continue
-            signed_area = 0.0
-            n = len(pts)
-            for i in range(n):
-                j = (i + 1) % n
-                signed_area += pts[i].X * pts[j].Y
-                signed_area -= pts[j].X * pts[i].Y
-            signed_area /= 2.0
-            abs_area = abs(signed_area)
+            # Shoelace: 0.5 * |sum(x_i * y_i+1 - x_i+1 * y_i)|
+            x = np.array(xs, dtype=np.float64)
+            y = np.array(ys, dtype=np.float64)
+            abs_area = 0.5 * abs(x.dot(np.roll(y, -1)) - y.dot(np.roll(x, -1)))
             if abs_area > max_abs_area:
                 max_abs_area = abs_area
                 exterior_loop = loop
@@ -1456,135 +1857,124 @@ def get_area_exterior_loop(area_elem):
         return None
 
 
-def get_area_boundary_polyline_dxf(area_elem, viewport, scale_factor, offset_x, offset_y):
+def get_area_boundary_polyline_dxf(area_elem, sheet_transform, scale_factor, offset_x, offset_y):
     """Build one area's exterior boundary polyline in DXF coordinates with bulges.
     
-    Extracts the exterior loop, transforms each segment to sheet then to DXF
-    real-world coordinates, and preserves arc bulge values.
+    Extracts the exterior loop, transforms its points from view to DXF
+    real-world coordinates in one combined affine, and preserves arc bulge values.
 
     Args:
         area_elem: DB.Area element
-        viewport: DB.Viewport element
+        sheet_transform: Viewport affine from build_sheet_transform()
         scale_factor: REALWORLD_SCALE_FACTOR
         offset_x: Horizontal offset (feet)
         offset_y: Vertical offset (feet)
 
     Returns:
         tuple: (dxf_pts, bulges)
-            dxf_pts: closed list of (x, y) in DXF coordinates
+            dxf_pts: closed list of [x, y] pairs in DXF coordinates
             bulges: list of bulge values (or None if no arcs)
     """
     exterior_loop = get_area_exterior_loop(area_elem)
     if exterior_loop is None:
         return None, None
 
-    boundary_points = []
-    bulges = []
-    tol = 1e-9
-
-    def _append_pt(pt_sheet, bulge_val):
-        if boundary_points:
-            prev = boundary_points[-1]
-            if abs(prev.X - pt_sheet.X) < tol and abs(prev.Y - pt_sheet.Y) < tol:
-                return
-        boundary_points.append(pt_sheet)
-        bulges.append(bulge_val)
-
+    tol = 1e-9 * scale_factor  # 1e-9 sheet feet, expressed in DXF units
+
+    # Single walk over the loop, storing raw VIEW coordinates as a flat
+    # X, Y, Z float list (structure of arrays once reshaped). Alongside it:
+    #   order      - point index of every polyline vertex, in drawing order
+    #   arc_firsts - first point index of each arc's (start, end, center, mid)
+    #   arc_slots  - position in order of each arc's start vertex (bulge slot)
+    # DB.Arc is sealed, so an exact type check replaces the isinstance interop call
+    arc_type = DB.Arc
+    flat = []
+    add_xyz = flat.extend  # bound once; called for every boundary point
+    order = []
+    arc_firsts = []
+    arc_slots = []
+    # A single try covers the whole walk: a curve that cannot be read means
+    # the boundary cannot be drawn faithfully, so the area is skipped.
     try:
-        view = doc.GetElement(viewport.ViewId)
-        transform_w_boundary = view.GetModelToProjectionTransforms()[0]
-        model_to_proj = transform_w_boundary.GetModelToProjectionTransform()
-        proj_to_sheet = viewport.GetProjectionToSheetTransform()
-        def _to_sheet(xyz):
-            return proj_to_sheet.OfPoint(model_to_proj.OfPoint(xyz))
-    except Exception:
-        def _to_sheet(xyz):
-            return transform_point_to_sheet(xyz, viewport)
+        for segment in exterior_loop:
+            curve = segment.GetCurve()
+            if curve is None:
+                continue
+            first = len(flat) // 3
+            if type(curve) is arc_type:
+                get_end_point = curve.GetEndPoint
+                for p in (get_end_point(0), get_end_point(1), curve.Center,
+                          curve.Evaluate(0.5, True)):
+                    add_xyz((p.X, p.Y, p.Z))
+                arc_firsts.append(first)
+                arc_slots.append(len(order))
+                order.append(first)
+            else:
+                tessellated_points = list(curve.Tessellate())[:-1]
+                for p in tessellated_points:
+                    add_xyz((p.X, p.Y, p.Z))
+                order.extend(range(first, first + len(tessellated_points)))
+    except Exception as ex:
+        print("  Warning: Failed to read boundary of area {}: {}".format(area_elem.Id, ex))
+        return None, None
 
-    for segment in exterior_loop:
-        curve = segment.GetCurve()
-        if isinstance(curve, DB.Arc):
-            try:
-                start_pt_view = curve.GetEndPoint(0)
-                end_pt_view = curve.GetEndPoint(1)
-                start_pt_sheet = _to_sheet(start_pt_view)
-                center_sheet = _to_sheet(curve.Center)
-                end_pt_sheet = _to_sheet(end_pt_view)
-
-                tessellated = list(curve.Tessellate())
-                if len(tessellated) >= 2:
-                    mid_idx = len(tessellated) // 2
-                    mid_sheet = _to_sheet(tessellated[mid_idx])
-                else:
-                    start_vec = DB.XYZ(start_pt_sheet.X - center_sheet.X, start_pt_sheet.Y - center_sheet.Y, 0)
-                    end_vec = DB.XYZ(end_pt_sheet.X - center_sheet.X, end_pt_sheet.Y - center_sheet.Y, 0)
-                    mid_vec_x = (start_vec.X + end_vec.X) / 2.0
-                    mid_vec_y = (start_vec.Y + end_vec.Y) / 2.0
-                    radius = math.hypot(start_vec.X, start_vec.Y)
-                    vec_len = math.hypot(mid_vec_x, mid_vec_y)
-                    if vec_len > 0:
-                        mid_sheet = DB.XYZ(
-                            center_sheet.X + (mid_vec_x / vec_len) * radius,
-                            center_sheet.Y + (mid_vec_y / vec_len) * radius,
-                            0
-                        )
-                    else:
-                        mid_sheet = start_pt_sheet
-
-                bulge = calculate_arc_bulge(start_pt_sheet, end_pt_sheet, center_sheet, mid_sheet)
-                _append_pt(start_pt_sheet, bulge)
-            except Exception as ex:
-                print("  Arc bulge error: {}".format(str(ex)))
-                try:
-                    start_pt_sheet = _to_sheet(curve.GetEndPoint(0))
-                    _append_pt(start_pt_sheet, 0.0)
-                except Exception:
-                    pass
-        else:
-            try:
-                tessellated_points = list(curve.Tessellate())
-                for pt_view in tessellated_points[:-1]:
-                    pt_sheet = _to_sheet(pt_view)
-                    _append_pt(pt_sheet, 0.0)
-            except Exception as ex:
-                print("  Warning: Failed to process line segment: {}".format(str(ex)))
+    if not order:
+        return None, None
 
-    # Close the boundary
-    if len(boundary_points) > 0:
-        _append_pt(boundary_points[0], 0.0)
+    # One matmul straight from VIEW to DXF coordinates, then gather vertices.
+    # Bulges are unchanged by the uniform scale and offset, so they are
+    # computed on the DXF points as well.
+    affine = build_dxf_affine(sheet_transform, scale_factor, offset_x, offset_y)
+    view_xyz = np.array(flat, dtype=np.float64).reshape(-1, 3)
+    dxf_pts = view_xyz @ affine[:, :3].T + affine[:, 3]
+    coords = dxf_pts[order]
+    bulge_arr = np.zeros(len(order), dtype=np.float64)
+    if arc_firsts:
+        # (K, 4, 2) gather of every arc's start, end, center and mid point
+        arc_quads = dxf_pts[np.add.outer(arc_firsts, np.arange(4))]
+        bulge_arr[arc_slots] = calculate_arc_bulges(arc_quads)
+
+    # Drop points that coincide (within tol) with their predecessor
+    keep = np.ones(len(coords), dtype=bool)
+    keep[1:] = np.any(np.abs(np.diff(coords, axis=0)) >= tol, axis=1)
+    coords = coords[keep]
+    bulge_arr = bulge_arr[keep]
 
-    if not boundary_points:
-        return None, None
+    # Close the boundary
+    if np.any(np.abs(coords[-1] - coords[0]) >= tol):
+        coords = np.vstack((coords, coords[:1]))
+        bulge_arr = np.append(bulge_arr, 0.0)
 
-    transformed_points = [
-        convert_point_to_realworld(pt, scale_factor, offset_x, offset_y)
-        for pt in boundary_points
-    ]
-    return transformed_points, bulges
+    transformed_points = coords.tolist()
+    # Arcs were recorded during the walk, so no scan is needed to decide
+    # whether the polyline needs bulges at all
+    return transformed_points, bulge_arr.tolist() if arc_firsts else None
 
 
-def process_area(area_elem, viewport, msp, scale_factor, offset_x, offset_y, municipality, layers, calculation_data):
+def process_area(area_elem, sheet_transform, msp, scale_factor, offset_x, offset_y, municipality, boundary_layer, text_layer, calculation_data, area_raw=None):
     """Process single Area element - add boundary and text to DXF.
     
     Args:
         area_elem: DB.Area element
-        viewport: DB.Viewport element (for coordinate transformation)
+        sheet_transform: Viewport affine from build_sheet_transform()
         msp: DXF modelspace
         scale_factor: REALWORLD_SCALE_FACTOR
         offset_x: Horizontal offset (feet)
         offset_y: Vertical offset (feet)
         municipality: Municipality name
-        layers: Layer name mapping
+        boundary_layer: DXF layer name for the area boundary
+        text_layer: DXF layer name for the area block
         calculation_data: Calculation data dict (for inheritance)
+        area_raw: Area JSON already read via get_json_data_batch (optional)
     """
     try:
         # Get area data with inheritance
-        area_data = get_area_data_for_dxf(area_elem, calculation_data, municipality)
+        area_data = get_area_data_for_dxf(area_elem, calculation_data, municipality, area_raw)
         if not area_data:
             return
         
         transformed_points, bulges = get_area_boundary_polyline_dxf(
-            area_elem, viewport, scale_factor, offset_x, offset_y)
+            area_elem, sheet_transform, scale_factor, offset_x, offset_y)
         if not transformed_points:
             print("  Warning: Area {} has no boundary".format(area_elem.Id))
             return
@@ -1593,8 +1983,8 @@ def process_area(area_elem, viewport, msp, scale_factor, offset_x, offset_y, mun
         add_polyline_with_arcs(
             msp, 
             transformed_points, 
-            layers['area_boundary'],
-            bulges if any(b != 0 for b in bulges) else None
+            boundary_layer,
+            bulges
         )
         
         # Insert area block at Location.Point
@@ -1603,17 +1993,15 @@ def process_area(area_elem, viewport, msp, scale_factor, offset_x, offset_y, mun
             loc_pt_view = location.Point
             
             # Transform VIEW to SHEET coordinates
-            loc_pt_sheet = transform_point_to_sheet(loc_pt_view, viewport)
+            sheet_x, sheet_y = transform_points_to_sheet([loc_pt_view], sheet_transform)[0]
             
             # Transform SHEET to DXF coordinates
-            insert_pos = convert_point_to_realworld(
-                loc_pt_sheet, scale_factor, offset_x, offset_y
-            )
+            insert_pos = ((sheet_x - offset_x) * scale_factor, (sheet_y - offset_y) * scale_factor)
             
             # Build block attributes and insert block
-            area_block_name = DXF_CONFIG[municipality]["blocks"]["area"]
+            area_block_name = _MUNI_CTX[municipality].area_block
             area_attribs = get_area_block_attribs(area_data, municipality, area_elem)
-            insert_block_with_attributes(msp, area_block_name, insert_pos, area_attribs, layer=layers['area_text'])
+            insert_block_with_attributes(msp, area_block_name, insert_pos, area_attribs, layer=text_layer)
         
     except Exception as e:
         print("  Warning: Error processing area {}: {}".format(area_elem.Id, e))
@@ -1642,13 +2030,14 @@ def process_areaplan_viewport(viewport, msp, scale_factor, offset_x, offset_y, m
         
         print("  Processing AreaPlan: {}".format(view.Name))
         
+        # View -> sheet transform, shared by every area in this viewport
+        sheet_transform = build_sheet_transform(viewport, view)
+        
         # Get areaplan data with inheritance
         areaplan_data = get_areaplan_data_for_dxf(view, calculation_data, municipality)
         
         # Get all areas in this view (needed early for Tel-Aviv clustering)
-        collector = DB.FilteredElementCollector(doc, view_id)
-        areas = collector.OfCategory(DB.BuiltInCategory.OST_Areas).WhereElementIsNotElementType().ToElements()
-        area_list = [a for a in areas if isinstance(a, DB.Area)]
+        area_list = get_view_areas(view_id)
         
         print("    Found {} areas".format(len(area_list)))
         
@@ -1659,26 +2048,29 @@ def process_areaplan_viewport(viewport, msp, scale_factor, offset_x, offset_y, m
                 area_polylines = []
                 for a in area_list:
                     pts, bgs = get_area_boundary_polyline_dxf(
-                        a, viewport, scale_factor, offset_x, offset_y)
+                        a, sheet_transform, scale_factor, offset_x, offset_y)
                     if pts:
                         area_polylines.append((pts, bgs))
                 cluster_frames = get_cluster_frames_for_telaviv(area_polylines) or None
             except Exception as e:
                 print("    Warning: Cluster frame generation failed, falling back to crop: {}".format(e))
-                import traceback
                 traceback.print_exc()
             if not cluster_frames:
                 print("    Tel-Aviv: No clusters found, falling back to crop boundary")
         
         # --- AREA POLYLINES (drawn first) ---
-        for auto_number, area in enumerate(area_list, start=1):
+        boundary_layer = layers['area_boundary']
+        text_layer = layers['area_text']
+        area_json = get_json_data_batch(area_list)
+        for auto_number, (area, area_raw) in enumerate(zip(area_list, area_json), start=1):
             _resolve_context["auto_number"] = auto_number
-            process_area(area, viewport, msp, scale_factor, offset_x, offset_y, municipality, layers, calculation_data)
+            process_area(area, sheet_transform, msp, scale_factor, offset_x, offset_y,
+                         municipality, boundary_layer, text_layer, calculation_data, area_raw)
         
         # --- FRAME DRAWING (drawn last so it is not obscured by area polylines;
         #     in DXF, later entities render on top) ---
         if cluster_frames:
-            areaplan_block_name = DXF_CONFIG[municipality]["blocks"]["areaplan"]
+            areaplan_block_name = _MUNI_CTX[municipality].areaplan_block
             areaplan_attribs = get_areaplan_block_attribs(areaplan_data, municipality, view, calculation_data)
             
             insert_pos = None
@@ -1707,8 +2099,7 @@ def process_areaplan_viewport(viewport, msp, scale_factor, offset_x, offset_y, m
             if block_pos is None:
                 # Fallback: use top-right of the largest cluster frame
                 largest_frame = max(cluster_frames, key=lambda f: len(f[0]))
-                max_x_dxf = max(x for x, y in largest_frame[0])
-                max_y_dxf = max(y for x, y in largest_frame[0])
+                max_x_dxf, max_y_dxf = np.max(largest_frame[0], axis=0).tolist()
                 block_pos = (max_x_dxf - 200.0, max_y_dxf - 200.0)
             insert_block_with_attributes(
                 msp, areaplan_block_name, block_pos, areaplan_attribs,
@@ -1719,7 +2110,6 @@ def process_areaplan_viewport(viewport, msp, scale_factor, offset_x, offset_y, m
         
     except Exception as e:
         print("  Warning: Error processing viewport: {}".format(e))
-        import traceback
         traceback.print_exc()
 
 
@@ -1753,10 +2143,7 @@ def _draw_crop_frame(view, viewport, msp, scale_factor, offset_x, offset_y, muni
             crop_points_view.append(start_pt)
     
     # Transform VIEW coordinates to SHEET coordinates
-    crop_points_sheet = []
-    for pt_view in crop_points_view:
-        pt_sheet = transform_point_to_sheet(pt_view, viewport)
-        crop_points_sheet.append(pt_sheet)
+    crop_points_sheet = transform_points_to_sheet(crop_points_view, build_sheet_transform(viewport, view))
     
     # Close the boundary
     if len(crop_points_sheet) == 0:
@@ -1764,17 +2151,15 @@ def _draw_crop_frame(view, viewport, msp, scale_factor, offset_x, offset_y, muni
     crop_points_sheet.append(crop_points_sheet[0])
     
     # Transform SHEET coordinates to DXF coordinates
-    transformed_crop = [
-        convert_point_to_realworld(pt, scale_factor, offset_x, offset_y)
-        for pt in crop_points_sheet
-    ]
+    transformed_crop = convert_points_to_realworld(
+        crop_points_sheet, scale_factor, offset_x, offset_y).tolist()
     
     # Add crop boundary rectangle/polyline
     add_polyline_with_arcs(msp, transformed_crop, layers['areaplan_frame'])
     
     # Insert areaplan block at top-right corner
     if len(transformed_crop) > 0:
-        areaplan_block_name = DXF_CONFIG[municipality]["blocks"]["areaplan"]
+        areaplan_block_name = _MUNI_CTX[municipality].areaplan_block
         areaplan_attribs = get_areaplan_block_attribs(areaplan_data, municipality, view, calculation_data)
         
         insert_pos = None
@@ -1797,8 +2182,7 @@ def _draw_crop_frame(view, viewport, msp, scale_factor, offset_x, offset_y, muni
         
         # Fallback: top-right corner (all other munis, or Tel-Aviv on failure)
         if insert_pos is None:
-            max_x_dxf = max(x for x, y in transformed_crop)
-            max_y_dxf = max(y for x, y in transformed_crop)
+            max_x_dxf, max_y_dxf = np.max(transformed_crop, axis=0).tolist()
             insert_pos = (max_x_dxf - 200.0, max_y_dxf - 200.0)
         
         insert_block_with_attributes(msp, areaplan_block_name, insert_pos, areaplan_attribs, layer=layers['areaplan_text'], rotation=rotation)
@@ -1883,7 +2267,6 @@ def process_sheet(sheet_elem, dxf_doc, msp, horizontal_offset, page_number, view
         custom_dwfx = sheet_data.get("DWFx_UnderlayFilename")
         if custom_dwfx and custom_dwfx.strip():
             # User provided a custom filename - use basename only (same folder as DXF)
-            import os
             dwfx_filename = os.path.basename(custom_dwfx.strip())
             # Ensure .dwfx extension
             if not dwfx_filename.lower().endswith('.dwfx'):
@@ -1911,7 +2294,7 @@ def process_sheet(sheet_elem, dxf_doc, msp, horizontal_offset, page_number, view
             add_rectangle(msp, min_point, max_point, layers['sheet_frame'])
         
         # Insert sheet block at top-right corner (skip if no sheet block for this municipality)
-        sheet_block_name = DXF_CONFIG[municipality]["blocks"].get("sheet")
+        sheet_block_name = _MUNI_CTX[municipality].sheet_block
         if sheet_block_name and titleblock and bbox:
             sheet_attribs = get_sheet_block_attribs(calculation_data, municipality, page_number)
             if sheet_attribs:
@@ -1957,10 +2340,40 @@ def get_municipality_from_sheets(sheets):
     return "Common"
 
 
+def _get_viewport_index():
+    """Index the project's viewports by sheet and its AreaPlan views by id.
+    
+    Built with one Viewport and one ViewPlan query on first use and kept in
+    _project_cache, so every Calculation group of a run validates against the
+    same index instead of re-querying the document.
+    
+    Returns:
+        tuple: (viewports_by_sheet, areaplan_views)
+            - viewports_by_sheet: {sheet id value: [DB.Viewport]}
+            - areaplan_views: {view id value: DB.ViewPlan} (AreaPlans only)
+    """
+    if "viewport_index" not in _project_cache:
+        # One project-wide Viewport query, bucketed by sheet, instead of a
+        # collector per sheet
+        viewports_by_sheet = defaultdict(list)
+        for viewport in DB.FilteredElementCollector(doc).OfClass(DB.Viewport):
+            viewports_by_sheet[get_element_id_value(viewport.SheetId)].append(viewport)
+        
+        # AreaPlan views by id: non-AreaPlan viewports are rejected by a dict
+        # probe instead of a doc.GetElement round-trip each
+        areaplan_views = {}
+        for view in DB.FilteredElementCollector(doc).OfClass(DB.ViewPlan):
+            if view.ViewType == DB.ViewType.AreaPlan:
+                areaplan_views[get_element_id_value(view.Id)] = view
+        
+        _project_cache["viewport_index"] = (dict(viewports_by_sheet), areaplan_views)
+    return _project_cache["viewport_index"]
+
+
 def get_valid_areaplans_and_uniform_scale(sheets):
     """Comprehensive validation: AreaScheme uniformity, valid AreaPlan views, and uniform scale.
     
-    Performs validation in single pass:
+    Reads each sheet's viewports once, then:
     1. Validates all sheets belong to same AreaScheme (via Calculation hierarchy)
     2. Filters valid AreaPlan views (has municipality, has areas, has scale)
     3. Validates uniform scale across all valid views
@@ -1976,52 +2389,70 @@ def get_valid_areaplans_and_uniform_scale(sheets):
     Returns:
         tuple: (uniform_scale, valid_viewports_dict)
             - uniform_scale: float, the validated uniform scale
-            - valid_viewports_dict: {sheet.Id: [list of valid DB.Viewport]}
+            - valid_viewports_dict: {sheet id value: [list of valid DB.Viewport]}
         
     Raises:
         ValueError: If no valid views found or mixed scales detected
     """
     try:
-        # ===== PHASE 1: Validate uniform AreaScheme across all sheets =====
-        schemes_found = {}  # {area_scheme_id: [sheet_numbers]}
+        # ===== SINGLE PASS: resolve each sheet's AreaScheme and collect its AreaPlans =====
+        # Viewports and views are read once per sheet; the AreaScheme holding the
+        # sheet's Calculation is taken from the same AreaPlan views that are
+        # later filtered for export.
+        schemes_found = defaultdict(list)  # {area_scheme_id: [sheets]}, numbered only on error
         missing_sheets = []  # [sheet_numbers] - sheets without CalculationGuid
+        sheet_areaplans = []  # [(sheet, [(viewport, view, area_scheme_id)])]
+        
+        viewports_by_sheet, areaplan_views = _get_viewport_index()
         
         for sheet in sheets:
             # Get sheet JSON data
-            sheet_data = get_json_data(sheet)
-            if not sheet_data:
-                missing_sheets.append(sheet.SheetNumber)
-                continue
-            
-            # Get CalculationGuid
-            calculation_guid = sheet_data.get("CalculationGuid")
-
+            sheet_data = get_sheet_json_data(sheet)
+            calculation_guid = sheet_data.get("CalculationGuid") if sheet_data else None
             if not calculation_guid:
                 missing_sheets.append(sheet.SheetNumber)
                 continue
-
-            # Resolve AreaScheme via viewports - find AreaPlan whose AreaScheme contains this Calculation
-            area_scheme = resolve_areascheme_for_calculation_on_sheet(sheet, calculation_guid)
-            if not area_scheme:
+            
+            area_scheme_id = None
+            areaplans = []
+            for viewport in viewports_by_sheet.get(get_element_id_value(sheet.Id), ()):
+                view = areaplan_views.get(get_element_id_value(viewport.ViewId))
+                if view is None:
+                    continue
+                
+                # Only AreaPlan views reach here, and they always expose AreaScheme
+                areascheme = view.AreaScheme
+                if not areascheme:
+                    continue
+                
+                scheme_id = get_element_id_value(areascheme.Id)
+                areaplans.append((viewport, view, scheme_id))
+                
+                # First AreaScheme on the sheet that contains this Calculation
+                if area_scheme_id is None and \
+                        calculation_guid in get_calculations_dict_for_areascheme(areascheme):
+                    area_scheme_id = scheme_id
+            
+            if area_scheme_id is None:
                 missing_sheets.append(sheet.SheetNumber)
                 continue
             
-            # Get AreaScheme ElementId value
-            area_scheme_id = str(get_element_id_value(area_scheme.Id))
-
             # Track which sheets belong to which AreaScheme
-            if area_scheme_id not in schemes_found:
-                schemes_found[area_scheme_id] = []
-            schemes_found[area_scheme_id].append(sheet.SheetNumber)
+            schemes_found[area_scheme_id].append(sheet)
+            
+            # Keep scanning after a second AreaScheme appears: sheets missing a
+            # Calculation are reported first, so every sheet must be checked.
+            # Only the AreaPlans for the scale pass are no longer needed.
+            if len(schemes_found) == 1:
+                sheet_areaplans.append((sheet, areaplans))
         
         # Error if sheets are missing Calculation
         if missing_sheets:
-            error_msg = "ERROR: Sheets not part of any Calculation!\n\n"
-            error_msg += "The following sheets have no CalculationGuid:\n"
-            for sheet_num in missing_sheets:
-                error_msg += "  - Sheet {}\n".format(sheet_num)
-            error_msg += "\nAll sheets must be assigned to a Calculation for DXF export."
-            raise ValueError(error_msg)
+            lines = ["ERROR: Sheets not part of any Calculation!", "",
+                     "The following sheets have no CalculationGuid:"]
+            lines.extend("  - Sheet {}".format(sheet_num) for sheet_num in missing_sheets)
+            lines.extend(["", "All sheets must be assigned to a Calculation for DXF export."])
+            raise ValueError("\n".join(lines))
         
         # Error if no schemes found at all
         if len(schemes_found) == 0:
@@ -2031,18 +2462,17 @@ def get_valid_areaplans_and_uniform_scale(sheets):
         
         # Error if multiple AreaSchemes detected
         if len(schemes_found) > 1:
-            error_msg = "ERROR: Multiple AreaSchemes detected!\n\n"
-            error_msg += "All selected sheets must belong to the same AreaScheme for DXF export.\n\n"
-            error_msg += "AreaSchemes found:\n"
-            for scheme_id, sheet_numbers in schemes_found.items():
+            lines = ["ERROR: Multiple AreaSchemes detected!", "",
+                     "All selected sheets must belong to the same AreaScheme for DXF export.", "",
+                     "AreaSchemes found:"]
+            for scheme_id, scheme_sheets in schemes_found.items():
                 # Get scheme name
                 scheme = get_area_scheme_by_id(scheme_id)
                 scheme_name = scheme.Name if scheme else "Unknown"
-                error_msg += "\n  AreaScheme '{}' (ID: {}):\n".format(scheme_name, scheme_id)
-                for sheet_num in sheet_numbers:
-                    error_msg += "    - Sheet {}\n".format(sheet_num)
-            error_msg += "\nPlease select sheets from the same AreaScheme only."
-            raise ValueError(error_msg)
+                lines.extend(["", "  AreaScheme '{}' (ID: {}):".format(scheme_name, scheme_id)])
+                lines.extend("    - Sheet {}".format(s.SheetNumber) for s in scheme_sheets)
+            lines.extend(["", "Please select sheets from the same AreaScheme only."])
+            raise ValueError("\n".join(lines))
         
         # All sheets have same AreaScheme - log success
         uniform_scheme_id = list(schemes_found.keys())[0]
@@ -2052,67 +2482,41 @@ def get_valid_areaplans_and_uniform_scale(sheets):
         print("  - AreaScheme: {} (ID: {})".format(scheme_name, uniform_scheme_id))
         print("  - Sheets: {}".format(len(sheets)))
         
-        # ===== PHASE 2: Filter valid AreaPlan views and validate scale =====
-        scales_found = {}  # {scale: [(sheet_number, view_name)]}
-        valid_viewports = {}  # {sheet.Id: [viewport]}
-        
-        uniform_scheme = get_area_scheme_by_id(uniform_scheme_id)
-        uniform_municipality = get_municipality_from_areascheme(uniform_scheme)
+        # ===== Filter valid AreaPlan views and validate scale =====
+        unique_scales = set()  # locations are only gathered if scales differ
+        valid_viewports = {}  # {sheet id value: [viewport]}
         
-        for sheet in sheets:
+        for sheet, areaplans in sheet_areaplans:
             sheet_valid_viewports = []
-            viewports = list(DB.FilteredElementCollector(doc, sheet.Id)
-                            .OfClass(DB.Viewport)
-                            .ToElements())
-            for viewport in viewports:
-                view = doc.GetElement(viewport.ViewId)
-
-                if not view or view.ViewType != DB.ViewType.AreaPlan:
+            for viewport, view, scheme_id in areaplans:
+                if scheme_id != uniform_scheme_id:
                     continue
-
-                try:
-                    areascheme = view.AreaScheme
-                except Exception:
-                    continue
-
-                if not areascheme:
-                    continue
-
-                if str(get_element_id_value(areascheme.Id)) != str(uniform_scheme_id):
-                    continue
-
-                municipality = uniform_municipality
                 
                 # Must have areas
-                areas = list(DB.FilteredElementCollector(doc, view.Id)
-                            .OfCategory(DB.BuiltInCategory.OST_Areas)
-                            .WhereElementIsNotElementType()
-                            .ToElements())
-                if not areas or len(areas) == 0:
+                if not get_view_areas(view.Id):
                     continue
                 
-                # Must have valid scale
-                if not hasattr(view, 'Scale'):
-                    continue
+                # AreaPlan views always carry a scale
                 scale = float(view.Scale)
                 
                 # This viewport is VALID!
                 sheet_valid_viewports.append(viewport)
+                unique_scales.add(scale)
                 
-                # Track scale for validation
-                if scale not in scales_found:
-                    scales_found[scale] = []
-                scales_found[scale].append({
-                    'sheet': sheet.SheetNumber,
-                    'view': view.Name
-                })
+                # Fail fast: a second scale already makes the export invalid,
+                # and the viewports seen so far show both scales
+                if len(unique_scales) > 1:
+                    break
             
             # Store valid viewports for this sheet
             if len(sheet_valid_viewports) > 0:
-                valid_viewports[sheet.Id] = sheet_valid_viewports
+                valid_viewports[get_element_id_value(sheet.Id)] = sheet_valid_viewports
+            
+            if len(unique_scales) > 1:
+                break
         
         # Check if we found any valid views
-        if len(scales_found) == 0:
+        if len(unique_scales) == 0:
             error_msg = "No valid AreaPlan views found.\n\n"
             error_msg += "Valid views must:\n"
             error_msg += "- Belong to an AreaScheme with defined municipality\n"
@@ -2121,19 +2525,25 @@ def get_valid_areaplans_and_uniform_scale(sheets):
             raise ValueError(error_msg)
         
         # Check for uniform scale
-        if len(scales_found) > 1:
-            error_msg = "ERROR: Mixed scales detected in valid AreaPlan views!\n\n"
-            error_msg += "All valid AreaPlan views must have the same scale for DXF export.\n\n"
-            error_msg += "Scales found:\n"
+        if len(unique_scales) > 1:
+            # Error path only: revisit the valid viewports for their locations
+            scales_found = defaultdict(list)  # {scale: [(sheet_number, view_name)]}
+            for sheet, _ in sheet_areaplans:
+                for viewport in valid_viewports.get(get_element_id_value(sheet.Id), ()):
+                    view = areaplan_views[get_element_id_value(viewport.ViewId)]
+                    scales_found[float(view.Scale)].append((sheet.SheetNumber, view.Name))
+            
+            lines = ["ERROR: Mixed scales detected in valid AreaPlan views!", "",
+                     "All valid AreaPlan views must have the same scale for DXF export.", "",
+                     "Scales found:"]
             for scale, locations in sorted(scales_found.items()):
-                error_msg += "\n  Scale 1:{}:\n".format(int(scale))
-                for loc in locations:
-                    error_msg += "    - Sheet {} / {}\n".format(loc['sheet'], loc['view'])
-            error_msg += "\nPlease ensure all AreaPlan views use the same scale before exporting."
-            raise ValueError(error_msg)
+                lines.extend(["", "  Scale 1:{}:".format(int(scale))])
+                lines.extend("    - Sheet {} / {}".format(sheet_num, view_name) for sheet_num, view_name in locations)
+            lines.extend(["", "Please ensure all AreaPlan views use the same scale before exporting."])
+            raise ValueError("\n".join(lines))
         
         # All valid views have same scale - perfect!
-        uniform_scale = list(scales_found.keys())[0]
+        uniform_scale = next(iter(unique_scales))
         total_viewports = sum(len(v) for v in valid_viewports.values())
         print("Validation passed:")
         print("  - Uniform scale: 1:{}".format(int(uniform_scale)))
@@ -2168,12 +2578,12 @@ def get_selected_sheets():
         selection = uidoc.Selection
         selected_ids = selection.GetElementIds()
         
-        if selected_ids and len(selected_ids) > 0:
-            sheets = []
-            for elem_id in selected_ids:
-                element = doc.GetElement(elem_id)
-                if isinstance(element, DB.ViewSheet):
-                    sheets.append(element)
+        if selected_ids and selected_ids.Count > 0:
+            # Filter to sheets natively; GetElementIds() already returns the
+            # ICollection<ElementId> the collector constructor expects
+            sheets = list(DB.FilteredElementCollector(doc, selected_ids)
+                          .OfClass(DB.ViewSheet)
+                          .ToElements())
             
             if len(sheets) > 0:
                 print("Found {} selected sheets".format(len(sheets)))
@@ -2188,6 +2598,10 @@ def get_selected_sheets():
         return None
 
 
+# Leading digits of a sheet number, compiled once for the sort key
+_SHEET_NUMBER_RE = re.compile(r'^(\d+)')
+
+
 def extract_sheet_number_for_sorting(sheet):
     """Extract numeric portion from sheet number for sorting.
     
@@ -2195,21 +2609,12 @@ def extract_sheet_number_for_sorting(sheet):
         sheet: DB.ViewSheet element
         
     Returns:
-        tuple: (numeric_part, full_sheet_number) for sorting
+        tuple: (numeric_part, full_sheet_number) for sorting;
+               sheets without a leading number sort as 999999
     """
-    try:
-        sheet_number = sheet.SheetNumber
-        
-        # Try to extract leading number
-        match = re.match(r'^(\d+)', sheet_number)
-        if match:
-            return (int(match.group(1)), sheet_number)
-        
-        # No leading number, sort alphabetically
-        return (999999, sheet_number)
-        
-    except:
-        return (999999, "")
+    sheet_number = sheet.SheetNumber or ""
+    match = _SHEET_NUMBER_RE.match(sheet_number)
+    return (int(match.group(1)) if match else 999999, sheet_number)
 
 
 def sort_sheets_by_number(sheets, descending=True):
@@ -2223,17 +2628,18 @@ def sort_sheets_by_number(sheets, descending=True):
         list: Sorted list of sheets
     """
     try:
-        # Sort by extracted number
-        sorted_sheets = sorted(sheets, 
-                              key=extract_sheet_number_for_sorting,
-                              reverse=descending)
+        # Decorate once so SheetNumber is read a single time per sheet,
+        # both for sorting and for the order printout
+        decorated = [(extract_sheet_number_for_sorting(sheet), sheet) for sheet in sheets]
+        decorated.sort(key=lambda item: item[0], reverse=descending)
         
         print("\nSheet order (left to right):")
-        for i, sheet in enumerate(sorted_sheets):
+        page_count = len(decorated)
+        for i, ((_, sheet_number), sheet) in enumerate(decorated):
             print("  {} - {} (Page {})".format(
-                sheet.SheetNumber, sheet.Name, len(sorted_sheets) - i))
+                sheet_number, sheet.Name, page_count - i))
         
-        return sorted_sheets
+        return [sheet for _, sheet in decorated]
         
     except Exception as e:
         print("Error sorting sheets: {}".format(e))
@@ -2251,20 +2657,18 @@ def group_sheets_by_calculation(initial_sheets):
               None key = sheets without CalculationGuid (not part of any Calculation)
     """
     try:
-        groups = {}
+        groups = defaultdict(list)
         
         for sheet in initial_sheets:
-            sheet_data = get_json_data(sheet) or {}
+            sheet_data = get_sheet_json_data(sheet) or {}
             calc_guid = sheet_data.get("CalculationGuid")
             
             # Use None as key for sheets not part of any Calculation
             key = calc_guid if calc_guid else None
             
-            if key not in groups:
-                groups[key] = []
             groups[key].append(sheet)
         
-        return groups
+        return dict(groups)
         
     except Exception as e:
         print("Warning: Error grouping sheets by calculation: {}".format(e))
@@ -2287,37 +2691,34 @@ def expand_calculation_sheets(calculation_guid):
             return []
         
         # Get schema
-        schema_guid = System.Guid(SCHEMA_GUID)
-        schema = ESSchema.Lookup(schema_guid)
+        schema, _ = get_es_schema()
         
         if not schema:
             print("Warning: pyArea schema not found")
             return []
         
-        # Query only elements with pyArea schema (much faster than all sheets)
-        from Autodesk.Revit.DB.ExtensibleStorage import ExtensibleStorageFilter
-        storage_filter = ExtensibleStorageFilter(schema_guid)
-        elements_with_schema = list(
-            DB.FilteredElementCollector(doc)
-            .WherePasses(storage_filter)
-            .ToElements()
-        )
-        
-        # Filter to sheets only and match CalculationGuid
-        matching_sheets = []
-        for element in elements_with_schema:
-            if isinstance(element, DB.ViewSheet):
-                sheet_data = get_json_data(element) or {}
+        # Index every pyArea sheet by CalculationGuid once per run; later
+        # Calculation groups are answered from the index without a new query
+        if not _calculation_sheets_cache:
+            # Query only sheets with pyArea schema (much faster than all sheets)
+            storage_filter = ExtensibleStorageFilter(schema.GUID)
+            sheets_with_schema = DB.FilteredElementCollector(doc)\
+                .OfClass(DB.ViewSheet)\
+                .WherePasses(storage_filter)
+            
+            for element in sheets_with_schema:
+                sheet_data = get_sheet_json_data(element) or {}
                 guid = sheet_data.get("CalculationGuid")
-                if guid == calculation_guid:
-                    matching_sheets.append(element)
+                if not guid:
+                    continue
+                _calculation_sheets_cache.setdefault(guid, []).append(element)
         
+        matching_sheets = list(_calculation_sheets_cache.get(calculation_guid, ()))
         print("  Matched {} sheets with CalculationGuid {}".format(len(matching_sheets), calculation_guid[:8]))
         return matching_sheets
         
     except Exception as e:
         print("Warning: Error expanding calculation sheets: {}".format(e))
-        import traceback
         traceback.print_exc()
         return []
 
@@ -2332,6 +2733,18 @@ if __name__ == '__main__':
         print("ExportDXF - Area Plans to DXF Export")
         print("="*60)
         
+        # Reset per-run caches (document may differ from a previous run)
+        _project_cache.clear()
+        _sheet_transform_cache.clear()
+        _view_areas_cache.clear()
+        _sheet_json_cache.clear()
+        _sheet_data_cache.clear()
+        _area_scheme_cache.clear()
+        _area_scheme_json_cache.clear()
+        _municipality_cache.clear()
+        _calculation_sheets_cache.clear()
+        _layer_dxfattribs.clear()
+        
         # 1. Get sheets (active or selected)
         initial_sheets = get_selected_sheets()
         if not initial_sheets or len(initial_sheets) == 0:
@@ -2421,6 +2834,7 @@ if __name__ == '__main__':
             # Create DXF document
             print("\nCreating DXF document...")
             dxf_doc = ezdxf.new('R2010')  # AutoCAD 2010 format (widely compatible)
+            _layers_cache.clear()  # id() of a discarded document may be reused
             dxf_doc.header['$INSUNITS'] = 5  # 5 = centimeters
             dxf_doc.styles.add('Standard', font='Arial.ttf')
             msp = dxf_doc.modelspace()
@@ -2438,18 +2852,23 @@ if __name__ == '__main__':
             
             # Build sorted floor elevations for <by Floor Above> placeholder
             # Only includes levels from AreaPlans in this calculation
+            # Valid viewports all show AreaPlan views, which are ViewPlans and
+            # expose GenLevel, so the views come from the validation index
             floor_elevations = []
             seen_level_ids = set()
+            areaplan_views = _get_viewport_index()[1]
             for vp_list in valid_viewports_map.values():
                 for vp in vp_list:
-                    v = doc.GetElement(vp.ViewId)
-                    if v and hasattr(v, 'GenLevel') and v.GenLevel:
-                        lid = v.GenLevel.Id
+                    v = areaplan_views.get(get_element_id_value(vp.ViewId))
+                    level = v.GenLevel if v is not None else None
+                    if level is not None:
+                        lid = level.Id
                         if lid not in seen_level_ids:
                             seen_level_ids.add(lid)
-                            floor_elevations.append((v.GenLevel.Elevation, lid))
+                            floor_elevations.append((level.Elevation, lid))
             floor_elevations.sort()
             _resolve_context["floor_elevations"] = floor_elevations
+            _represented_view_cache.clear()
             
             # Process each sheet with horizontal offset
             horizontal_offset = 0.0  # In Revit feet
@@ -2459,7 +2878,7 @@ if __name__ == '__main__':
                 page_number = total_sheets - i  # Rightmost = page 1
                 
                 # Get pre-validated viewports for this sheet
-                valid_viewports = valid_viewports_map.get(sheet.Id, [])
+                valid_viewports = valid_viewports_map.get(get_element_id_value(sheet.Id), [])
                 
                 # Only process sheets with valid viewports
                 if len(valid_viewports) > 0:
@@ -2488,7 +2907,9 @@ if __name__ == '__main__':
             
             # Save DXF file, binary format is needed for jerusalem municipality
             print("\nSaving DXF file...")
-            dxf_doc.saveas(dxf_path, fmt='bin')
+            # Stream through a 1 MiB buffer: fewer, larger sequential writes
+            with open(dxf_path, 'wb', buffering=1 << 20) as dxf_stream:
+                dxf_doc.write(dxf_stream, fmt='bin')
             print("DXF saved: {}".format(dxf_path))
             
             # Create .dat file with DWFx_SCALE value (Common municipality only)
@@ -2530,7 +2951,6 @@ if __name__ == '__main__':
         print("="*60)
         
     except Exception as e:
-        import traceback
         error_msg = "Error during export:\n\n{}".format(str(e))
         print("\n" + "="*60)
         print("ERROR")
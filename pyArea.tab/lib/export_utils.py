@@ -89,13 +89,14 @@ def generate_dxf_filename(doc, sheets, calc_name):
         calc_name: Calculation name string (will be sanitized)
     """
     model = sanitize_filename_part(_get_project_label(doc))
-    sheet_numbers = [s.SheetNumber for s in sheets]
-    if len(sheet_numbers) == 1:
-        sheets_part = sanitize_filename_part(sheet_numbers[0])
+    # Only the ends of the range are needed; SheetNumber is a Revit API read
+    first_number = sheets[0].SheetNumber
+    if len(sheets) == 1:
+        sheets_part = sanitize_filename_part(first_number)
     else:
         sheets_part = "{}..{}".format(
-            sanitize_filename_part(sheet_numbers[0]),
-            sanitize_filename_part(sheet_numbers[-1])
+            sanitize_filename_part(first_number),
+            sanitize_filename_part(sheets[-1].SheetNumber)
         )
     calc_part = re.sub(r'[^\w\-_]', '_', calc_name.strip())
     # return "{}-A-{}_{}".format(model, sheets_part, calc_part)